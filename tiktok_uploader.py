@@ -12,21 +12,29 @@ TikTok Sandbox API対応版
 import os
 import sys
 import json
+import time
+import random
+import functools
 import shutil
 import secrets
 import hashlib
 import base64
-import webbrowser
 import urllib.parse
-import argparse
-from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from collections import deque
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import requests
 from dotenv import load_dotenv
 
+# requests / http.server / webbrowser / argparse などは使う関数内で遅延import
+# （--status などの軽いコマンドの起動時間を短くするため）
+
+try:
+    import orjson
+except ImportError:  # orjson未インストール時は標準jsonで代用
+    orjson = None
+
 # 環境変数読み込み
 load_dotenv()
 
@@ -36,6 +44,16 @@ TIKTOK_CLIENT_SECRET = os.getenv('TIKTOK_CLIENT_SECRET', '')
 REDIRECT_URI = os.getenv('TIKTOK_REDIRECT_URI', 'http://localhost:8080/callback')
 SCOPES = 'user.info.basic,video.publish,video.upload'
 
+# 認証URLの固定部分（state と code_challenge のみ実行時に付与）
+AUTH_URL = "https://www.tiktok.com/v2/auth/authorize/"
+_AUTH_BASE_QUERY = urllib.parse.urlencode({
+    'client_key': TIKTOK_CLIENT_KEY,
+    'scope': SCOPES,
+    'response_type': 'code',
+    'redirect_uri': REDIRECT_URI,
+    'code_challenge_method': 'S256',
+})
+
 # API URLs
 # Sandbox: https://open.tiktokapis.com/v2
 # Production: https://open.tiktokapis.com/v2
@@ -44,10 +62,33 @@ API_BASE = "https://open.tiktokapis.com/v2"
 # ファイルパス
 BASE_DIR = Path(__file__).parent
 TOKENS_FILE = BASE_DIR / 'tiktok_tokens.json'
-HISTORY_FILE = BASE_DIR / 'upload_history.json'
+HISTORY_FILE = BASE_DIR / 'upload_history.jsonl'  # 1行1レコードの追記専用ログ
+LEGACY_HISTORY_FILE = BASE_DIR / 'upload_history.json'
 VIDEOS_DIR = BASE_DIR / 'videos'
 SAMPLE_VIDEO = BASE_DIR / 'sample_video.mp4'
 
+# キャッシュ（動画フォルダの一覧など）
+CACHE_DIR = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache')) / 'speakcycle'
+VIDEO_LIST_CACHE = CACHE_DIR / 'videos.cache'
+
+# チャンクアップロード（TikTok仕様: 5MB〜64MB、最終チャンクは余りを含めて128MBまで）
+UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+
+# 言語別一括投稿の同時アップロード数
+MAX_PARALLEL_UPLOADS = 4
+
+# 公開ステータス確認（初回は即時、以降は指数バックオフ + ジッター）
+STATUS_POLL_ATTEMPTS = 12
+STATUS_POLL_BASE_DELAY = 0.5
+STATUS_POLL_MAX_DELAY = 15
+STATUS_POLL_TIMEOUT = 60
+
+# アクセストークンの有効期限がこの秒数以内なら事前にリフレッシュ
+TOKEN_REFRESH_MARGIN = 60
+
+# トークンファイルに保存したユーザー情報の有効期間
+USER_INFO_TTL = 7 * 24 * 3600  # 7日（秒）
+
 # 言語設定（本番用）
 LANGUAGES = {
     'jp': {
@@ -84,31 +125,122 @@ LANGUAGES = {
     },
 }
 
-# PKCE用
-_code_verifier: Optional[str] = None
+# 言語ごとの投稿時刻（UTC 0時からの秒数）を起動時に一度だけ計算
+LANG_KEYS = tuple(LANGUAGES)
+LANG_POST_UTC_SECONDS = tuple(
+    ((config['post_hour'] - config['utc_offset']) * 3600 + config['post_minute'] * 60) % 86400
+    for config in LANGUAGES.values()
+)
+# 投稿時刻（UTC）が早い順の言語キー
+LANG_KEYS_BY_POST_TIME = tuple(lang for _, lang in sorted(zip(LANG_POST_UTC_SECONDS, LANG_KEYS)))
+
+
+# === JSON入出力 ===
+def _json_loads(data: bytes):
+    """JSONバイト列をデコード（orjson優先）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, indent: bool = True) -> bytes:
+    """JSONバイト列にエンコード（orjson優先、indent=Falseでコンパクト形式）"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _atomic_write(path: Path, data: bytes, durable: bool = True):
+    """一時ファイルに書いてからos.replaceで置き換え（中断されても壊れたファイルを残さない）
+
+    durable=False ならfsyncを省略する（作り直せるキャッシュ向け）。
+    一時ファイルは0600で作成し、既存ファイルがあればそのパーミッションを引き継ぐ。
+    """
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        # 書き込み失敗・中断時にトークンのコピーを残さない
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+# === 日時 ===
+# 日時はUNIX時間（time.time()）で保存し、表示時のみ整形する
+def _to_epoch(value) -> float:
+    """保存された日時をUNIX時間に変換（旧形式のISO文字列にも対応）"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp()
+
+
+def format_timestamp(value, fmt: str = '%Y-%m-%d %H:%M') -> str:
+    """保存された日時を表示用文字列に整形"""
+    if not value:
+        return 'N/A'
+    return datetime.fromtimestamp(_to_epoch(value)).strftime(fmt)
 
 
 # === トークン管理 ===
+@functools.lru_cache(maxsize=1)
 def load_tokens() -> dict:
-    """トークンを読み込み"""
+    """トークンを読み込み（プロセス内でキャッシュし、save_tokensで破棄）"""
     if TOKENS_FILE.exists():
-        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _json_loads(TOKENS_FILE.read_bytes())
     return {}
 
 
 def save_tokens(tokens: dict):
     """トークンを保存"""
-    with open(TOKENS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(tokens, f, indent=2, ensure_ascii=False)
+    try:
+        _atomic_write(TOKENS_FILE, _json_dumps(tokens))
+    finally:
+        # 呼び出し側がキャッシュ済みのdictを直接変更しているため、保存失敗時も破棄する
+        load_tokens.cache_clear()
 
 
 def get_access_token(account: str = 'default') -> str:
-    """アクセストークンを取得"""
+    """アクセストークンを取得（期限切れ間近なら自動リフレッシュ）"""
     tokens = load_tokens()
-    if account in tokens:
-        return tokens[account].get('access_token', '')
-    return ''
+    if account not in tokens:
+        return ''
+    
+    expires_at = tokens[account].get('expires_at')
+    if expires_at:
+        remaining = _to_epoch(expires_at) - time.time()
+        if remaining < TOKEN_REFRESH_MARGIN and refresh_access_token(account):
+            print(f"🔄 トークンを自動リフレッシュしました ({account})")
+            tokens = load_tokens()
+    
+    return tokens[account].get('access_token', '')
+
+
+def _token_expiry(data: dict, now: float) -> dict:
+    """トークンレスポンスから expires_in / expires_at を算出
+
+    expires_in が無い・0以下の場合は expires_at をNoneにし、事前リフレッシュを行わない
+    （現在時刻を期限にすると get_access_token が毎回リフレッシュしてしまうため）。
+    """
+    expires_in = data.get('expires_in') or 0
+    return {
+        'expires_in': expires_in,
+        'expires_at': now + expires_in if expires_in > 0 else None,
+    }
 
 
 def refresh_access_token(account: str = 'default') -> bool:
@@ -121,7 +253,7 @@ def refresh_access_token(account: str = 'default') -> bool:
     if not refresh_token:
         return False
     
-    response = requests.post(f'{API_BASE}/oauth/token/', data={
+    response = get_session().post(f'{API_BASE}/oauth/token/', data={
         'client_key': TIKTOK_CLIENT_KEY,
         'client_secret': TIKTOK_CLIENT_SECRET,
         'grant_type': 'refresh_token',
@@ -135,109 +267,148 @@ def refresh_access_token(account: str = 'default') -> bool:
     if 'access_token' not in data:
         return False
     
+    now = time.time()
     tokens[account].update({
         'access_token': data['access_token'],
         'refresh_token': data.get('refresh_token', refresh_token),
-        'refreshed_at': datetime.now().isoformat(),
+        **_token_expiry(data, now),
+        'refreshed_at': now,
     })
     save_tokens(tokens)
     return True
 
 
 # === 履歴管理 ===
-def load_history() -> dict:
-    """アップロード履歴を読み込み"""
-    if HISTORY_FILE.exists():
-        with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {'uploads': []}
+def _migrate_legacy_history():
+    """旧形式（upload_history.json）の履歴をJSON Linesへ移行"""
+    if HISTORY_FILE.exists() or not LEGACY_HISTORY_FILE.exists():
+        return
+    uploads = _json_loads(LEGACY_HISTORY_FILE.read_bytes()).get('uploads', [])
+    _atomic_write(HISTORY_FILE, b''.join(_json_dumps(record, indent=False) + b'\n' for record in uploads))
 
 
-def save_history(history: dict):
-    """アップロード履歴を保存"""
-    with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(history, f, indent=2, ensure_ascii=False)
+def load_recent_history(limit: int = 5) -> list:
+    """直近のアップロード履歴のみ読み込み（ファイル全体はパースしない）"""
+    _migrate_legacy_history()
+    if not HISTORY_FILE.exists():
+        return []
+    with open(HISTORY_FILE, 'rb') as f:
+        tail = deque((line for line in f if line.strip()), maxlen=limit)
+    return [_json_loads(line) for line in tail]
 
 
 def add_to_history(account: str, video_path: str, success: bool, is_sandbox: bool = False):
-    """履歴に追加"""
-    history = load_history()
-    history['uploads'].append({
+    """履歴に追加（1行追記のみ）"""
+    _migrate_legacy_history()
+    record = {
         'account': account,
         'video': str(video_path),
-        'uploaded_at': datetime.now().isoformat(),
+        'uploaded_at': time.time(),
         'success': success,
         'sandbox': is_sandbox,
-    })
-    save_history(history)
+    }
+    with open(HISTORY_FILE, 'ab') as f:
+        f.write(_json_dumps(record, indent=False) + b'\n')
 
 
-# === OAuth認証 ===
-class OAuthHTTPServer(HTTPServer):
-    """OAuth用のカスタムHTTPServer"""
-    auth_code: Optional[str] = None
-    error: Optional[str] = None
+# === 動画フォルダ ===
+def cached_glob(directory: Path, pattern: str) -> list[Path]:
+    """フォルダのmtimeが変わっていなければキャッシュ済みの一覧を返すglob"""
+    key = f'{directory}|{pattern}'
+    mtime_ns = directory.stat().st_mtime_ns
+    
+    cache = {}
+    if VIDEO_LIST_CACHE.exists():
+        try:
+            cache = _json_loads(VIDEO_LIST_CACHE.read_bytes())
+        except ValueError:
+            cache = {}  # 壊れたキャッシュは作り直す
+    
+    entry = cache.get(key)
+    if entry and entry.get('mtime_ns') == mtime_ns:
+        return [Path(p) for p in entry['paths']]
+    
+    paths = sorted(directory.glob(pattern))
+    cache[key] = {'mtime_ns': mtime_ns, 'paths': [str(p) for p in paths]}
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _atomic_write(VIDEO_LIST_CACHE, _json_dumps(cache, indent=False), durable=False)
+    except OSError:
+        pass  # キャッシュが書けなくても一覧は返す
+    return paths
 
 
-class CallbackHandler(BaseHTTPRequestHandler):
-    """OAuth コールバックハンドラー"""
-    server: OAuthHTTPServer
+# === OAuth認証 ===
+def create_oauth_server(address: tuple):
+    """OAuthコールバック受信用のHTTPServerを生成"""
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    
+    class OAuthHTTPServer(HTTPServer):
+        """OAuth用のカスタムHTTPServer"""
+        auth_code: Optional[str] = None
+        error: Optional[str] = None
     
-    def do_GET(self):
-        parsed = urllib.parse.urlparse(self.path)
-        if parsed.path == '/callback':
-            params = urllib.parse.parse_qs(parsed.query)
+    class CallbackHandler(BaseHTTPRequestHandler):
+        """OAuth コールバックハンドラー"""
+        server: OAuthHTTPServer
+    
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            if parsed.path == '/callback':
+                params = urllib.parse.parse_qs(parsed.query)
             
-            if 'code' in params:
-                self.server.auth_code = params['code'][0]
-                self.send_response(200)
-                self.send_header('Content-type', 'text/html; charset=utf-8')
-                self.end_headers()
-                html = '''
-                    <!DOCTYPE html>
-                    <html><body style="font-family:Arial;text-align:center;padding:50px;background:#f0f0f0;">
-                    <div style="background:white;padding:40px;border-radius:10px;max-width:400px;margin:auto;">
-                    <h1 style="color:#25F4EE;">✅ 認証成功!</h1>
-                    <p>SpeakCycleがTikTokと正常に連携されました</p>
-                    <p style="color:#888;">このウィンドウを閉じてください</p>
-                    </div>
-                    </body></html>
-                '''
-                self.wfile.write(html.encode('utf-8'))
+                if 'code' in params:
+                    self.server.auth_code = params['code'][0]
+                    self.send_response(200)
+                    self.send_header('Content-type', 'text/html; charset=utf-8')
+                    self.end_headers()
+                    html = '''
+                        <!DOCTYPE html>
+                        <html><body style="font-family:Arial;text-align:center;padding:50px;background:#f0f0f0;">
+                        <div style="background:white;padding:40px;border-radius:10px;max-width:400px;margin:auto;">
+                        <h1 style="color:#25F4EE;">✅ 認証成功!</h1>
+                        <p>SpeakCycleがTikTokと正常に連携されました</p>
+                        <p style="color:#888;">このウィンドウを閉じてください</p>
+                        </div>
+                        </body></html>
+                    '''
+                    self.wfile.write(html.encode('utf-8'))
+                else:
+                    self.server.auth_code = None
+                    self.server.error = params.get('error', ['unknown'])[0]
+                    self.send_response(400)
+                    self.send_header('Content-type', 'text/html; charset=utf-8')
+                    self.end_headers()
+                    html = f'''
+                        <!DOCTYPE html>
+                        <html><body style="font-family:Arial;text-align:center;padding:50px;">
+                        <h1 style="color:#FE2C55;">❌ 認証エラー</h1>
+                        <p>エラー: {self.server.error}</p>
+                        </body></html>
+                    '''
+                    self.wfile.write(html.encode('utf-8'))
             else:
-                self.server.auth_code = None
-                self.server.error = params.get('error', ['unknown'])[0]
-                self.send_response(400)
-                self.send_header('Content-type', 'text/html; charset=utf-8')
+                self.send_response(404)
                 self.end_headers()
-                html = f'''
-                    <!DOCTYPE html>
-                    <html><body style="font-family:Arial;text-align:center;padding:50px;">
-                    <h1 style="color:#FE2C55;">❌ 認証エラー</h1>
-                    <p>エラー: {self.server.error}</p>
-                    </body></html>
-                '''
-                self.wfile.write(html.encode('utf-8'))
-        else:
-            self.send_response(404)
-            self.end_headers()
     
-    def log_message(self, *args):
-        pass  # ログ抑制
+        def log_message(self, *args):
+            pass  # ログ抑制
+    
+    return OAuthHTTPServer(address, CallbackHandler)
 
 
-def generate_pkce() -> str:
-    """PKCE用のcode_verifierとcode_challengeを生成"""
-    global _code_verifier
-    _code_verifier = ''.join(secrets.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789') for _ in range(64))
-    code_challenge = hashlib.sha256(_code_verifier.encode('ascii')).hexdigest()
-    return code_challenge
+def generate_pkce() -> tuple[str, str]:
+    """PKCE用の (code_verifier, code_challenge) を生成
+
+    TikTokのデスクトップ向けPKCEではcode_challengeはSHA256の16進表記。
+    """
+    code_verifier = secrets.token_urlsafe(48)  # 64文字 [A-Za-z0-9_-]
+    code_challenge = hashlib.sha256(code_verifier.encode('ascii')).hexdigest()
+    return code_verifier, code_challenge
 
 
 def authenticate(account: str = 'default') -> bool:
     """TikTokアカウントを認証"""
-    global _code_verifier
-    
     if not TIKTOK_CLIENT_KEY or not TIKTOK_CLIENT_SECRET:
         print("❌ 環境変数を設定してください:")
         print("   TIKTOK_CLIENT_KEY")
@@ -248,26 +419,20 @@ def authenticate(account: str = 'default') -> bool:
     print("=" * 50)
     
     # PKCE生成
-    code_challenge = generate_pkce()
+    code_verifier, code_challenge = generate_pkce()
     
     # 認証URL生成
-    params = {
-        'client_key': TIKTOK_CLIENT_KEY,
-        'scope': SCOPES,
-        'response_type': 'code',
-        'redirect_uri': REDIRECT_URI,
-        'state': account,
-        'code_challenge': code_challenge,
-        'code_challenge_method': 'S256',
-    }
-    auth_url = f"https://www.tiktok.com/v2/auth/authorize/?{urllib.parse.urlencode(params)}"
+    auth_url = (
+        f"{AUTH_URL}?{_AUTH_BASE_QUERY}"
+        f"&state={urllib.parse.quote(account, safe='')}&code_challenge={code_challenge}"
+    )
     
     print(f"\n📱 ブラウザでTikTokにログインしてください...")
     print(f"   Redirect URI: {REDIRECT_URI}")
     
     # ローカルサーバー起動
     try:
-        server = OAuthHTTPServer(('localhost', 8080), CallbackHandler)
+        server = create_oauth_server(('localhost', 8080))
     except OSError as e:
         print(f"❌ ポート8080が使用中です: {e}")
         return False
@@ -276,6 +441,7 @@ def authenticate(account: str = 'default') -> bool:
     server.error = None
     
     # ブラウザで開く
+    import webbrowser
     webbrowser.open(auth_url)
     
     # コールバック待ち
@@ -290,13 +456,13 @@ def authenticate(account: str = 'default') -> bool:
     # トークン取得
     print("🔄 アクセストークン取得中...")
     
-    response = requests.post(f'{API_BASE}/oauth/token/', data={
+    response = get_session().post(f'{API_BASE}/oauth/token/', data={
         'client_key': TIKTOK_CLIENT_KEY,
         'client_secret': TIKTOK_CLIENT_SECRET,
         'code': server.auth_code,
         'grant_type': 'authorization_code',
         'redirect_uri': REDIRECT_URI,
-        'code_verifier': _code_verifier,
+        'code_verifier': code_verifier,
     })
     
     if response.status_code != 200:
@@ -311,27 +477,102 @@ def authenticate(account: str = 'default') -> bool:
     
     # トークン保存
     tokens = load_tokens()
+    now = time.time()
     tokens[account] = {
         'access_token': data['access_token'],
         'refresh_token': data.get('refresh_token', ''),
-        'expires_in': data.get('expires_in', 0),
+        **_token_expiry(data, now),
         'open_id': data.get('open_id', ''),
         'scope': data.get('scope', ''),
-        'authenticated_at': datetime.now().isoformat(),
+        'authenticated_at': now,
     }
     save_tokens(tokens)
+    user_info = get_cached_user_info(account, data['access_token'])
     
     print(f"\n✅ 認証成功!")
+    if user_info:
+        print(f"   アカウント: {user_info.get('display_name', 'Unknown')}")
     print(f"   Open ID: {data.get('open_id', 'N/A')[:20]}...")
     print(f"   スコープ: {data.get('scope', 'N/A')}")
     
     return True
 
 
+# === HTTP ===
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """共有HTTPセッション（接続を使い回し、一時的なエラーは指数バックオフで再試行）"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        # raise_on_status=False: 再試行を使い切ったら最後のレスポンスを返し、呼び出し側のstatus_code判定に任せる
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ))
+    return session
+
+
 # === 動画アップロード ===
+def plan_chunks(video_size: int) -> tuple[int, int]:
+    """(chunk_size, total_chunk_count) を算出（端数は最終チャンクに含める）"""
+    if video_size <= UPLOAD_CHUNK_SIZE:
+        return video_size, 1
+    return UPLOAD_CHUNK_SIZE, video_size // UPLOAD_CHUNK_SIZE
+
+
+class FileSlice:
+    """ファイルの一部分をメモリに載せずにストリーム送信するためのラッパー
+
+    requestsは __len__ でContent-Lengthを決め、read() で少しずつ送信する。
+    tell/seek はurllib3がリトライ時に先頭へ巻き戻すために使う。
+    os.pread が使える環境では lseek + read の2回ではなく1回のシステムコールで読む。
+    """
+    
+    def __init__(self, f, start: int, length: int):
+        self._f = f
+        self._start = start
+        self._length = length
+        self._pos = 0
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def tell(self) -> int:
+        return self._pos
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._pos = max(0, min(offset, self._length))
+        return self._pos
+    
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._length - self._pos
+        if size < 0 or size > remaining:
+            size = remaining
+        if hasattr(os, 'pread'):
+            data = os.pread(self._f.fileno(), size, self._start + self._pos)
+        else:
+            self._f.seek(self._start + self._pos)
+            data = self._f.read(size)
+        self._pos += len(data)
+        return data
+
+
 def get_user_info(access_token: str) -> dict:
     """ユーザー情報を取得"""
-    response = requests.get(
+    response = get_session().get(
         f"{API_BASE}/user/info/",
         headers={'Authorization': f'Bearer {access_token}'},
         params={'fields': 'open_id,display_name,avatar_url'}
@@ -342,8 +583,27 @@ def get_user_info(access_token: str) -> dict:
     return {}
 
 
+def get_cached_user_info(account: str, access_token: str) -> dict:
+    """トークンファイルに保存したユーザー情報を返す（未取得・期限切れ時のみAPIを呼ぶ）"""
+    tokens = load_tokens()
+    entry = tokens.get(account, {})
+    user_info = entry.get('user_info')
+    fetched_at = entry.get('user_info_at')
+    if user_info and fetched_at and time.time() - _to_epoch(fetched_at) < USER_INFO_TTL:
+        return user_info
+    
+    user_info = get_user_info(access_token)
+    if user_info and account in tokens:
+        tokens[account].update({
+            'user_info': user_info,
+            'user_info_at': time.time(),
+        })
+        save_tokens(tokens)
+    return user_info
+
+
 def upload_video_direct(video_path: str, caption: str, access_token: str, 
-                        privacy: str = 'SELF_ONLY', is_sandbox: bool = False) -> dict:
+                        privacy: str = 'SELF_ONLY', is_sandbox: bool = False, label: str = '') -> dict:
     """
     TikTokに動画をDirect Postでアップロード
     
@@ -352,22 +612,27 @@ def upload_video_direct(video_path: str, caption: str, access_token: str,
     - MUTUAL_FOLLOW_FRIENDS: 相互フォロー
     - FOLLOWER_OF_CREATOR: フォロワー
     - PUBLIC_TO_EVERYONE: 全員（本番のみ）
+    
+    label: 進捗表示の各行に付ける接頭辞（言語別一括投稿で並列実行する際の識別用）
     """
+    prefix = f"[{label}] " if label else ''
     video_path = Path(video_path)
-    if not video_path.exists():
+    try:
+        video_size = video_path.stat().st_size
+    except (FileNotFoundError, NotADirectoryError):
         return {'success': False, 'error': 'Video file not found'}
     
-    video_size = video_path.stat().st_size
+    chunk_size, total_chunks = plan_chunks(video_size)
     
-    print(f"\n📤 アップロード開始")
-    print(f"   ファイル: {video_path.name}")
-    print(f"   サイズ: {video_size / 1024 / 1024:.2f} MB")
-    print(f"   公開設定: {privacy}")
+    print(f"\n{prefix}📤 アップロード開始")
+    print(f"{prefix}   ファイル: {video_path.name}")
+    print(f"{prefix}   サイズ: {video_size / 1024 / 1024:.2f} MB")
+    print(f"{prefix}   公開設定: {privacy}")
     if is_sandbox:
-        print(f"   ⚠️ Sandboxモード（視聴数制限あり）")
+        print(f"{prefix}   ⚠️ Sandboxモード（視聴数制限あり）")
     
     # Step 1: Initialize upload
-    print("\n1️⃣ アップロード初期化...")
+    print(f"\n{prefix}1️⃣ アップロード初期化...")
     
     init_payload = {
         'post_info': {
@@ -381,12 +646,12 @@ def upload_video_direct(video_path: str, caption: str, access_token: str,
         'source_info': {
             'source': 'FILE_UPLOAD',
             'video_size': video_size,
-            'chunk_size': video_size,  # Single chunk upload
-            'total_chunk_count': 1,
+            'chunk_size': chunk_size,
+            'total_chunk_count': total_chunks,
         }
     }
     
-    init_response = requests.post(
+    init_response = get_session().post(
         f"{API_BASE}/post/publish/video/init/",
         headers={
             'Authorization': f'Bearer {access_token}',
@@ -422,37 +687,43 @@ def upload_video_direct(video_path: str, caption: str, access_token: str,
             'details': init_data
         }
     
-    print(f"   Publish ID: {publish_id}")
+    print(f"{prefix}   Publish ID: {publish_id}")
     
     # Step 2: Upload video file
-    print("\n2️⃣ 動画ファイルをアップロード中...")
-    
-    with open(video_path, 'rb') as f:
-        video_data = f.read()
+    print(f"\n{prefix}2️⃣ 動画ファイルをアップロード中...")
     
-    upload_response = requests.put(
-        upload_url,
-        data=video_data,
-        headers={
-            'Content-Type': 'video/mp4',
-            'Content-Range': f'bytes 0-{video_size - 1}/{video_size}'
-        }
-    )
-    
-    if upload_response.status_code not in [200, 201]:
-        return {
-            'success': False,
-            'error': f"Upload failed: {upload_response.status_code}",
-            'details': upload_response.text
-        }
+    with open(video_path, 'rb', buffering=0) as f:  # FileSliceが直接読むのでバッファ不要
+        for i in range(total_chunks):
+            start = i * chunk_size
+            end = video_size - 1 if i == total_chunks - 1 else start + chunk_size - 1
+            upload_response = get_session().put(
+                upload_url,
+                data=FileSlice(f, start, end - start + 1),
+                headers={
+                    'Content-Type': 'video/mp4',
+                    'Content-Range': f'bytes {start}-{end}/{video_size}'
+                }
+            )
+            
+            if upload_response.status_code not in [200, 201, 206]:
+                return {
+                    'success': False,
+                    'error': f"Upload failed at chunk {i + 1}/{total_chunks}: {upload_response.status_code}",
+                    'details': upload_response.text
+                }
+            
+            if total_chunks > 1:
+                print(f"{prefix}   📦 チャンク {i + 1}/{total_chunks} 送信完了")
     
-    print("   ✅ アップロード完了!")
+    print(f"{prefix}   ✅ アップロード完了!")
     
     # Step 3: Check publish status
-    print("\n3️⃣ 公開ステータスを確認中...")
+    print(f"\n{prefix}3️⃣ 公開ステータスを確認中...")
     
-    for i in range(10):  # 最大10回チェック
-        status_response = requests.post(
+    # 初回はアップロード直後に待たずに確認（小さい動画はこの時点で完了していることが多い）
+    deadline = time.monotonic() + STATUS_POLL_TIMEOUT
+    for i in range(STATUS_POLL_ATTEMPTS):
+        status_response = get_session().post(
             f"{API_BASE}/post/publish/status/fetch/",
             headers={
                 'Authorization': f'Bearer {access_token}',
@@ -466,7 +737,7 @@ def upload_video_direct(video_path: str, caption: str, access_token: str,
             publish_status = status_data.get('data', {}).get('status')
             
             if publish_status == 'PUBLISH_COMPLETE':
-                print("   ✅ 公開完了!")
+                print(f"{prefix}   ✅ 公開完了!")
                 return {
                     'success': True,
                     'publish_id': publish_id,
@@ -480,13 +751,13 @@ def upload_video_direct(video_path: str, caption: str, access_token: str,
                     'publish_id': publish_id
                 }
             elif publish_status in ['PROCESSING_UPLOAD', 'PROCESSING_DOWNLOAD', 'SENDING_TO_USER_INBOX']:
-                print(f"   ⏳ 処理中: {publish_status}")
-                import time
-                time.sleep(3)
-                continue
+                print(f"{prefix}   ⏳ 処理中: {publish_status}")
         
-        import time
-        time.sleep(2)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or i == STATUS_POLL_ATTEMPTS - 1:
+            break  # 最後の確認の後は待たずに返す
+        delay = min(STATUS_POLL_MAX_DELAY, STATUS_POLL_BASE_DELAY * 2 ** i) + random.random()
+        time.sleep(min(delay, remaining))
     
     return {
         'success': True,  # 送信自体は成功
@@ -507,8 +778,8 @@ def post_sandbox_video(video_path: str = None, caption: str = None) -> bool:
         print("❌ 認証が必要です: python tiktok_uploader.py --auth")
         return False
     
-    # ユーザー情報取得
-    user_info = get_user_info(access_token)
+    # ユーザー情報（認証時に保存済みのものを再利用）
+    user_info = get_cached_user_info('default', access_token)
     if user_info:
         print(f"\n👤 アカウント: {user_info.get('display_name', 'Unknown')}")
     
@@ -520,7 +791,7 @@ def post_sandbox_video(video_path: str = None, caption: str = None) -> bool:
     else:
         # videosフォルダから探す
         if VIDEOS_DIR.exists():
-            videos = list(VIDEOS_DIR.glob('*.mp4'))
+            videos = cached_glob(VIDEOS_DIR, '*.mp4')
             if videos:
                 video_file = videos[0]
             else:
@@ -565,6 +836,73 @@ def post_sandbox_video(video_path: str = None, caption: str = None) -> bool:
         return False
 
 
+def find_language_video(lang: str, date: str) -> Optional[Path]:
+    """言語フォルダから指定日付の動画を探す"""
+    folder = VIDEOS_DIR / LANGUAGES[lang]['folder']
+    if not folder.exists():
+        return None
+    videos = sorted(folder.glob(f'*{date}*.mp4'))
+    return videos[0] if videos else None
+
+
+def post_all_languages(date: str, caption: str = None) -> bool:
+    """全言語の動画を並列で投稿（アカウント名 = 言語キー、投稿時刻が早い言語から開始）"""
+    print("\n" + "=" * 60)
+    print(f"🌏 言語別一括投稿: {date}")
+    print("=" * 60)
+    
+    # トークン・動画の解決は逐次で行い、通信部分のみ並列化する
+    jobs = []
+    for lang in LANG_KEYS_BY_POST_TIME:
+        config = LANGUAGES[lang]
+        access_token = get_access_token(lang)
+        if not access_token:
+            print(f"   ⏭️ {config['name']}: 未認証 (python tiktok_uploader.py --auth --account {lang})")
+            continue
+        video_file = find_language_video(lang, date)
+        if not video_file:
+            print(f"   ⏭️ {config['name']}: 動画なし ({VIDEOS_DIR / config['folder']})")
+            continue
+        lang_caption = f"{caption or '📚 Learn English!'} {config['hashtags']}"
+        jobs.append((lang, video_file, lang_caption, access_token))
+    
+    if not jobs:
+        print("❌ 投稿できる動画がありません")
+        return False
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    get_session()  # ワーカースレッドで同時に生成されないよう先に作成
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_UPLOADS) as executor:
+        futures = [
+            executor.submit(
+                upload_video_direct, str(video_file), lang_caption, access_token, 'PUBLIC_TO_EVERYONE', label=lang
+            )
+            for lang, video_file, lang_caption, access_token in jobs
+        ]
+        results = []
+        for future in futures:
+            # 1言語の例外で他言語の結果・履歴が失われないよう失敗として記録
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({'success': False, 'error': str(e)})
+    
+    print("\n" + "=" * 60)
+    print("📋 投稿結果")
+    print("=" * 60)
+    all_success = True
+    for (lang, video_file, _, _), result in zip(jobs, results):
+        add_to_history(lang, str(video_file), result['success'])
+        if result['success']:
+            print(f"   ✅ {LANGUAGES[lang]['name']}: {result.get('publish_id')} ({result.get('status')})")
+        else:
+            all_success = False
+            print(f"   ❌ {LANGUAGES[lang]['name']}: {result.get('error')}")
+    
+    return all_success
+
+
 # === 状態表示 ===
 def show_status():
     """システム状態を表示"""
@@ -580,30 +918,28 @@ def show_status():
         print("   ❌ 未認証")
     else:
         for account, data in tokens.items():
-            auth_time = data.get('authenticated_at', 'N/A')
             scope = data.get('scope', 'N/A')
             print(f"   ✅ {account}")
-            print(f"      認証日時: {auth_time[:19] if auth_time != 'N/A' else 'N/A'}")
+            print(f"      認証日時: {format_timestamp(data.get('authenticated_at'), '%Y-%m-%d %H:%M:%S')}")
             print(f"      スコープ: {scope}")
     
     # 動画フォルダ状態
     print("\n📁 動画フォルダ:")
     if VIDEOS_DIR.exists():
-        videos = list(VIDEOS_DIR.glob('*.mp4'))
+        videos = cached_glob(VIDEOS_DIR, '*.mp4')
         print(f"   📂 {VIDEOS_DIR}")
         print(f"   📹 {len(videos)} 件の動画")
     else:
         print(f"   ❌ {VIDEOS_DIR} が存在しません")
     
     # 履歴
-    history = load_history()
-    recent = history.get('uploads', [])[-5:]
+    recent = load_recent_history(5)
     if recent:
         print("\n📜 最近のアップロード:")
         for item in reversed(recent):
             status = "✅" if item.get('success') else "❌"
             mode = "🧪" if item.get('sandbox') else "📤"
-            print(f"   {status} {mode} {item.get('uploaded_at', '')[:16]} - {Path(item.get('video', '')).name}")
+            print(f"   {status} {mode} {format_timestamp(item.get('uploaded_at'))} - {Path(item.get('video', '')).name}")
 
 
 def show_help():
@@ -627,6 +963,9 @@ def show_help():
 4. 本番投稿（承認後）:
    python tiktok_uploader.py --post --video path/to/video.mp4
 
+5. 言語別一括投稿（videos/<言語フォルダ>/ の指定日付の動画）:
+   python tiktok_uploader.py --post --date 2026-01-23
+
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 📋 セットアップ手順
@@ -649,6 +988,13 @@ def show_help():
 
 # === メイン ===
 def main():
+    # 単独の --status はargparseを組み立てずに即処理（--account 等が付く場合は通常の解析）
+    if len(sys.argv) == 2 and sys.argv[1] == '--status':
+        show_status()
+        return
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='SpeakCycle TikTok Video Uploader',
         formatter_class=argparse.RawDescriptionHelpFormatter
@@ -659,6 +1005,7 @@ def main():
     parser.add_argument('--sandbox', action='store_true', help='Sandboxモードで投稿')
     parser.add_argument('--video', type=str, help='動画ファイルパス')
     parser.add_argument('--caption', type=str, help='キャプション')
+    parser.add_argument('--date', type=str, help='言語別一括投稿の日付 (YYYY-MM-DD)')
     parser.add_argument('--status', action='store_true', help='状態を表示')
     parser.add_argument('--refresh', action='store_true', help='トークンをリフレッシュ')
     
@@ -686,10 +1033,13 @@ def main():
     if args.post:
         if args.sandbox:
             post_sandbox_video(args.video, args.caption)
+        elif args.date:
+            post_all_languages(args.date, args.caption)
         else:
             if not args.video:
                 print("❌ --video オプションで動画ファイルを指定してください")
                 print("   またはSandboxモードを使用: --post --sandbox")
+                print("   または言語別一括投稿: --post --date YYYY-MM-DD")
                 return
             
             access_token = get_access_token(args.account)